@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +17,13 @@ class Settings(BaseSettings):
     default_voice: str = "af"
     use_gpu: bool = True  # Whether to use GPU acceleration if available
     use_onnx: bool = False  # Whether to use ONNX runtime
+    onnx_tune_cache_dir: Optional[str] = None  # Directory for tuned ONNX thread configs (defaults to the model's directory)
+    onnx_intel_safe_optlevel: bool = True  # Cap ONNX CPU graph optimization at "extended" on Intel
+    onnx_shape_specialize: bool = False  # Fix ONNX batch dim and annotate shapes on first CPU load
+    onnx_quantize: bool = False  # Run ONNX on CPU with INT8-quantized weights, quantizing on first load
+    onnx_use_dnnl: bool = True  # Use oneDNN execution provider on Intel CPUs when onnxruntime provides it
+    onnx_profile_kernels: bool = False  # Profile a few runs on load and warn about slow kernel selections
+    onnx_pin_threads: bool = False  # Pin ONNX CPU intra-op threads to physical cores of the first socket
     allow_local_voice_saving: bool = False  # Whether to allow saving combined voices locally
     
     # Container absolute paths
@@ -14,9 +14,13 @@ class ONNXCPUConfig(BaseModel):
     num_threads: int = Field(8, description="Number of threads for parallel operations")
     inter_op_threads: int = Field(4, description="Number of threads for operator parallelism")
     execution_mode: str = Field("parallel", description="ONNX execution mode")
-    optimization_level: str = Field("all", description="ONNX optimization level")
+    optimization_level: str = Field("all", description="ONNX optimization level ('all', 'extended', 'basic' or 'disable')")
     memory_pattern: bool = Field(True, description="Enable memory pattern optimization")
-    arena_extend_strategy: str = Field("kNextPowerOfTwo", description="Memory arena strategy")
+    arena_extend_strategy: str = Field("kSameAsRequested", description="Memory arena strategy")
+    arena_initial_chunk_mb: int = Field(64, description="Initial CPU arena chunk size in MB")
+    arena_growth_chunk_mb: int = Field(32, description="First CPU arena extension size in MB")
+    arena_max_dead_mb: int = Field(8, description="Unused bytes allowed per arena chunk before splitting, in MB")
+    auto_tune_threads: bool = Field(True, description="Tune and cache thread counts on first CPU load")
 
     class Config:
         frozen = True
@@ -27,6 +31,7 @@ class ONNXGPUConfig(ONNXCPUConfig):
     
     # CUDA settings
     device_id: int = Field(0, description="CUDA device ID")
+    arena_extend_strategy: str = Field("kNextPowerOfTwo", description="Memory arena strategy")
     gpu_mem_limit: float = Field(0.5, description="Fraction of GPU memory to use")
     cudnn_conv_algo_search: str = Field("EXHAUSTIVE", description="CuDNN convolution algorithm search")
     
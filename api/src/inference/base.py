@@ -1,6 +1,8 @@
 """Base interfaces for model inference."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 import numpy as np
@@ -44,6 +46,30 @@ class ModelBackend(ABC):
         """
         pass
 
+    async def generate_async(
+        self,
+        tokens: List[int],
+        voice: torch.Tensor,
+        speed: float = 1.0
+    ) -> np.ndarray:
+        """Generate audio from async code.
+        
+        Runs generate() inline by default; backends that can compute off the
+        event loop override this.
+        
+        Args:
+            tokens: Input token IDs
+            voice: Voice embedding tensor
+            speed: Speed multiplier
+            
+        Returns:
+            Generated audio samples
+            
+        Raises:
+            RuntimeError: If generation fails
+        """
+        return self.generate(tokens, voice, speed)
+
     @abstractmethod
     def unload(self) -> None:
         """Unload model and free resources."""
@@ -73,10 +99,15 @@ class ModelBackend(ABC):
 class BaseModelBackend(ModelBackend):
     """Base implementation of model backend."""
 
+    # Run generate() on a dedicated inference thread from generate_async()
+    _threaded_inference = False
+
     def __init__(self):
         """Initialize base backend."""
         self._model: Optional[torch.nn.Module] = None
         self._device: str = "cpu"
+        # Started on first use when _threaded_inference is set
+        self._infer_pool: Optional[ThreadPoolExecutor] = None
 
     @property
     def is_loaded(self) -> bool:
@@ -88,8 +119,58 @@ class BaseModelBackend(ModelBackend):
         """Get device model is running on."""
         return self._device
 
+    async def generate_async(
+        self,
+        tokens: List[int],
+        voice: torch.Tensor,
+        speed: float = 1.0
+    ) -> np.ndarray:
+        """Generate audio from async code.
+        
+        Backends with _threaded_inference run generate() on an inference
+        thread, leaving the event loop free, and others run it inline. The
+        thread starts on first use, so it comes back after an unload however
+        the backend is given its model.
+        
+        Args:
+            tokens: Input token IDs
+            voice: Voice embedding tensor
+            speed: Speed multiplier
+            
+        Returns:
+            Generated audio samples
+            
+        Raises:
+            RuntimeError: If generation fails
+        """
+        if not self._threaded_inference or not self.is_loaded:
+            return self.generate(tokens, voice, speed)
+        self._start_infer_pool()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._infer_pool, self.generate, tokens, voice, speed
+        )
+
+    def _start_infer_pool(self) -> None:
+        """Create the inference thread if not running.
+        
+        A single worker, so calls queue onto the session and any persistent
+        input buffers in order.
+        """
+        if self._infer_pool is None:
+            self._infer_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ort-infer"
+            )
+
+    def _shutdown_infer_pool(self) -> None:
+        """Stop the inference thread once queued calls finish."""
+        if self._infer_pool is not None:
+            self._infer_pool.shutdown(wait=False)
+            self._infer_pool = None
+
     def unload(self) -> None:
         """Unload model and free resources."""
+        self._shutdown_infer_pool()
         if self._model is not None:
             del self._model
             self._model = None
@@ -0,0 +1,105 @@
+"""Host CPU detection for ONNX runtime tuning."""
+
+import os
+import platform
+from functools import lru_cache
+from typing import Dict, List
+
+import psutil
+
+# cpuinfo flags for SIMD extensions that MLAS dispatches kernels on
+SIMD_FLAGS = {
+    "avx2": "AVX2",
+    "avx512f": "AVX-512",
+    "avx512_vnni": "AVX512-VNNI",
+    "amx_tile": "AMX",
+}
+
+
+@lru_cache(maxsize=1)
+def _read_cpuinfo() -> Dict[str, str]:
+    """Read the first processor block from /proc/cpuinfo.
+
+    Returns:
+        Mapping of cpuinfo keys to values, empty if unavailable
+    """
+    info: Dict[str, str] = {}
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if not line.strip():
+                    break
+                key, _, value = line.partition(":")
+                info[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return info
+
+
+def physical_cores() -> int:
+    """Get number of physical CPU cores.
+
+    Returns:
+        Physical core count, falling back to logical count
+    """
+    return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+
+def socket_core_cpus(socket: int = 0) -> List[int]:
+    """Get one logical CPU per physical core on a socket.
+
+    Only CPUs in this process's affinity mask are considered. Without sysfs
+    topology, all allowed CPUs are returned.
+
+    Args:
+        socket: Physical package ID
+
+    Returns:
+        Sorted logical CPU IDs, the first hyperthread of each core, empty
+        where CPU affinity is unsupported (e.g. macOS)
+    """
+    try:
+        allowed = sorted(psutil.Process().cpu_affinity())
+    except AttributeError:
+        return []
+    cores: Dict[int, int] = {}
+    try:
+        for cpu in allowed:
+            topology = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+            with open(f"{topology}/physical_package_id") as f:
+                if int(f.read()) != socket:
+                    continue
+            with open(f"{topology}/core_id") as f:
+                cores.setdefault(int(f.read()), cpu)
+    except (OSError, ValueError):
+        return allowed
+    return sorted(cores.values())
+
+
+def cpu_vendor() -> str:
+    """Get CPU vendor identifier.
+
+    Returns:
+        Vendor string such as 'GenuineIntel' or 'AuthenticAMD', empty if unknown
+    """
+    return _read_cpuinfo().get("vendor_id", "")
+
+
+def simd_features() -> List[str]:
+    """Get SIMD extensions supported by the host CPU.
+
+    Returns:
+        Display names of detected extensions, empty if unknown
+    """
+    flags = set(_read_cpuinfo().get("flags", "").split())
+    return [name for flag, name in SIMD_FLAGS.items() if flag in flags]
+
+
+def cpu_id() -> str:
+    """Get identifier for the host CPU model.
+
+    Returns:
+        CPU model name and physical core count
+    """
+    model = _read_cpuinfo().get("model name") or platform.processor() or "unknown"
+    return f"{model} ({physical_cores()} cores)"
@@ -0,0 +1,596 @@
+"""Shared, offline-optimized ONNX CPU sessions."""
+
+import hashlib
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import onnxruntime
+from loguru import logger
+from onnxruntime import (
+    ExecutionMode,
+    GraphOptimizationLevel,
+    InferenceSession,
+    OrtAllocatorType,
+    OrtArenaCfg,
+    OrtMemoryInfo,
+    OrtMemType,
+    SessionOptions
+)
+
+from ..core.config import settings
+from ..core.model_config import model_config
+from .cpu_info import (
+    cpu_id,
+    cpu_vendor,
+    physical_cores,
+    simd_features,
+    socket_core_cpus
+)
+from .quantize import get_quantized_model
+from .session_options import (
+    OPTIMIZATION_LEVELS,
+    create_provider_options,
+    create_session_options
+)
+from .session_registry import get_or_create_session
+from .shape_specialize import get_shaped_model
+
+# Cached thread configurations, keyed by model hash, CPU and graph setup
+THREAD_CACHE_FILE = "ort_threads.json"
+AUTOTUNE_RUNS = 5
+
+# Kernel profiles written on load with settings.onnx_profile_kernels
+PROFILE_PREFIX = "/tmp/ort_profile"
+PROFILE_RUNS = 3
+# Larger conv filters fall into a slow direct NCHWc kernel on AVX-512
+MAX_NCHWC_FILTER = 7
+
+ARENA_EXTEND_STRATEGIES = {"kNextPowerOfTwo": 0, "kSameAsRequested": 1}
+
+
+_cpu_arena_registered = False
+
+
+@lru_cache(maxsize=8)
+def _file_digest(model_path: str, mtime_ns: int, size: int) -> str:
+    """Hash file contents, cached per path, mtime and size."""
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_digest(model_path: str) -> str:
+    """Compute SHA-256 of a model file.
+    
+    Args:
+        model_path: Path to model file
+        
+    Returns:
+        Hex digest of file contents
+    """
+    stat = os.stat(model_path)
+    return _file_digest(model_path, stat.st_mtime_ns, stat.st_size)
+
+
+def optimized_model_path(model_path: str, optimization_level: str) -> str:
+    """Get cache path for an offline-optimized model.
+    
+    The name is keyed by source model hash, optimization level, ONNX Runtime
+    version and CPU, so any change produces a fresh file. The model is stored
+    in ORT format, which loads without protobuf parsing.
+    
+    Args:
+        model_path: Path to source model file
+        optimization_level: Optimization level name
+        
+    Returns:
+        Path to optimized model file
+    """
+    key = ":".join([
+        model_digest(model_path),
+        optimization_level,
+        onnxruntime.__version__,
+        cpu_id(),
+    ])
+    tag = hashlib.sha256(key.encode()).hexdigest()[:16]
+    stem, _ = os.path.splitext(model_path)
+    return f"{stem}.{tag}.opt.ort"
+
+
+def _benchmark_inputs(session: InferenceSession) -> Dict[str, np.ndarray]:
+    """Build synthetic inputs for timing a session.
+    
+    Args:
+        session: Session to build inputs for
+        
+    Returns:
+        Input feed with a short token sequence and neutral style
+    """
+    rng = np.random.default_rng(0)
+    inputs = {}
+    for arg in session.get_inputs():
+        if arg.name in ("tokens", "input_ids"):
+            inputs[arg.name] = rng.integers(1, 100, (1, 64), dtype=np.int64)
+        elif arg.name == "speed":
+            inputs[arg.name] = np.ones(1, dtype=np.float32)
+        else:
+            inputs[arg.name] = rng.standard_normal((1, 256)).astype(np.float32) * 0.1
+    return inputs
+
+
+def thread_cache_path(model_path: str) -> Path:
+    """Get path of the tuned thread configuration cache.
+    
+    Kept next to the model by default, so it persists wherever models do.
+    
+    Args:
+        model_path: Path to model file
+        
+    Returns:
+        Cache file path
+    """
+    cache_dir = settings.onnx_tune_cache_dir or os.path.dirname(os.path.abspath(model_path))
+    return Path(cache_dir) / THREAD_CACHE_FILE
+
+
+def _time_thread_config(
+    model_path: str,
+    intra: int,
+    inter: int,
+    optimization_level: str
+) -> float:
+    """Time inference under one thread configuration.
+    
+    Args:
+        model_path: Path to model file
+        intra: Intra-op thread count
+        inter: Inter-op thread count
+        optimization_level: Optimization level name of the serving session
+        
+    Returns:
+        Median run time in seconds
+    """
+    providers, provider_options = create_cpu_providers()
+    options = SessionOptions()
+    options.graph_optimization_level = OPTIMIZATION_LEVELS.get(
+        optimization_level, GraphOptimizationLevel.ORT_DISABLE_ALL
+    )
+    options.intra_op_num_threads = intra
+    options.inter_op_num_threads = inter
+    options.execution_mode = (
+        ExecutionMode.ORT_PARALLEL if inter > 1 else ExecutionMode.ORT_SEQUENTIAL
+    )
+    session = InferenceSession(
+        model_path,
+        sess_options=options,
+        providers=providers,
+        provider_options=provider_options
+    )
+    inputs = _benchmark_inputs(session)
+    session.run(None, inputs)  # Untimed warmup
+    
+    timings = []
+    for _ in range(AUTOTUNE_RUNS):
+        start = time.perf_counter()
+        session.run(None, inputs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def autotune_threads(model_path: str, optimization_level: str) -> Tuple[int, int, str]:
+    """Get tuned CPU thread configuration for a model.
+    
+    Sweeps intra-op threads over physical cores and half that, and inter-op
+    pools over 1 and 2, keeping the fastest. Sessions are built with the
+    serving optimization level and providers, so the graph being timed is
+    the one that runs. Results are cached on disk per model hash, CPU and
+    graph setup, so the sweep only runs on first load.
+    
+    Args:
+        model_path: Path to model file
+        optimization_level: Optimization level name of the serving session
+        
+    Returns:
+        Tuple of (intra-op threads, inter-op threads, execution mode)
+    """
+    providers, _ = create_cpu_providers()
+    key = ":".join([model_digest(model_path), cpu_id(), optimization_level, *providers])
+    cache_path = thread_cache_path(model_path)
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache:
+        intra, inter, mode = cache[key]
+        return intra, inter, mode
+    
+    cores = physical_cores()
+    best = None
+    for inter in (1, 2):
+        for intra in sorted({cores, max(1, cores // 2)}):
+            elapsed = _time_thread_config(model_path, intra, inter, optimization_level)
+            logger.debug(f"Thread config intra={intra} inter={inter}: {elapsed * 1000:.1f}ms")
+            if best is None or elapsed < best[0]:
+                best = (elapsed, intra, inter)
+    
+    _, intra, inter = best
+    mode = "parallel" if inter > 1 else "sequential"
+    logger.info(f"Tuned ONNX CPU threads: intra={intra}, inter={inter}, mode={mode}")
+    
+    cache[key] = [intra, inter, mode]
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Failed to cache thread config: {e}")
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return intra, inter, mode
+
+
+def resolve_optimization_level() -> str:
+    """Get effective CPU graph optimization level name.
+    
+    Returns:
+        Optimization level name
+    """
+    config = model_config.onnx_cpu
+    if (
+        config.optimization_level == "all"
+        and settings.onnx_intel_safe_optlevel
+        and cpu_vendor() == "GenuineIntel"
+    ):
+        # NCHWc layout transforms can select a much slower direct AVX-512 conv on Intel
+        return "extended"
+    return config.optimization_level
+
+
+def log_cpu_features(optimization_level: str) -> None:
+    """Log host CPU features that decide MLAS kernel selection.
+    
+    Args:
+        optimization_level: Optimization level name
+    """
+    features = simd_features()
+    # NCHWc layout transforms run at the 'all' level on x86 SIMD hosts
+    nchwc = optimization_level == "all" and bool(features)
+    logger.info(
+        f"ONNX CPU: {cpu_id()}, SIMD: {', '.join(features) or 'none detected'}, "
+        f"optimization: {optimization_level}, "
+        f"NCHWc layout: {'enabled' if nchwc else 'disabled'}"
+    )
+
+
+def profile_kernels(
+    model_path: str,
+    graph_optimization_level: GraphOptimizationLevel,
+    providers: List[str],
+    provider_options: List[Dict]
+) -> List[str]:
+    """Profile a few runs to report the kernels ONNX Runtime selected.
+    
+    Runs on a separate session, since profiling stays on for the life of a
+    session. Op counts are logged, and a warning is raised for NCHWc convs
+    with large filters on AVX-512 hosts.
+    
+    Args:
+        model_path: Path to model file, as loaded by the real session
+        graph_optimization_level: Optimization level of the real session
+        providers: Execution providers
+        provider_options: Provider options
+        
+    Returns:
+        Names of NCHWc conv nodes with large filters
+    """
+    options = SessionOptions()
+    options.graph_optimization_level = graph_optimization_level
+    options.enable_profiling = True
+    options.profile_file_prefix = PROFILE_PREFIX
+    session = InferenceSession(
+        model_path,
+        sess_options=options,
+        providers=providers,
+        provider_options=provider_options
+    )
+    inputs = _benchmark_inputs(session)
+    for _ in range(PROFILE_RUNS):
+        session.run(None, inputs)
+    profile_path = session.end_profiling()
+    with open(profile_path) as f:
+        events = json.load(f)
+    
+    kernels = {}
+    for event in events:
+        if event.get("cat") == "Node" and event["name"].endswith("_kernel_time"):
+            kernels[event["name"][:-len("_kernel_time")]] = event["args"]
+    op_counts = Counter(args["op_name"] for args in kernels.values())
+    logger.info(f"ONNX kernel profile written to {profile_path}: {dict(op_counts)}")
+    
+    large_convs = []
+    for node, args in kernels.items():
+        if args["op_name"] != "Conv" or not node.endswith("_nchwc"):
+            continue
+        shapes = [next(iter(shape.values())) for shape in args["input_type_shape"]]
+        if len(shapes) > 1 and max(shapes[1][2:], default=0) > MAX_NCHWC_FILTER:
+            large_convs.append(node)
+    if large_convs and "AVX-512" in simd_features():
+        logger.warning(
+            f"NCHWc convs with filters over {MAX_NCHWC_FILTER} may use a slow direct "
+            f"AVX-512 kernel: {large_convs}. Consider the 'extended' optimization level"
+        )
+    return large_convs
+
+
+def create_cpu_session_options(model_path: str, optimization_level: str) -> SessionOptions:
+    """Create ONNX CPU session options.
+    
+    Args:
+        model_path: Model file, used to auto-tune thread counts
+        optimization_level: Optimization level name
+        
+    Returns:
+        Configured session options
+    """
+    options = create_session_options(is_gpu=False, optimization_level=optimization_level)
+    
+    # Configure threading
+    if model_config.onnx_cpu.auto_tune_threads:
+        intra, inter, mode = autotune_threads(model_path, optimization_level)
+        options.intra_op_num_threads = intra
+        options.inter_op_num_threads = inter
+        options.execution_mode = (
+            ExecutionMode.ORT_PARALLEL
+            if mode == "parallel"
+            else ExecutionMode.ORT_SEQUENTIAL
+        )
+    
+    # Let idle ORT workers sleep rather than spin between requests
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    options.add_session_config_entry("session.inter_op.allow_spinning", "0")
+    
+    if settings.onnx_pin_threads:
+        pin_threads(options, options.intra_op_num_threads)
+    
+    # Share one pre-sized CPU arena across sessions
+    options.enable_cpu_mem_arena = True
+    register_cpu_arena()
+    options.add_session_config_entry("session.use_env_allocators", "1")
+    
+    return options
+
+
+def pin_threads(options: SessionOptions, intra: int) -> None:
+    """Pin intra-op threads to physical cores of the first socket.
+    
+    Keeping workers on one NUMA node also keeps the arena's first-touch
+    pages local to them.
+    
+    Args:
+        options: Session options to configure
+        intra: Intra-op thread count
+    """
+    cpus = socket_core_cpus(0)
+    if not cpus:
+        logger.warning("Not pinning ONNX threads, CPU affinity is unsupported here")
+        return
+    if len(cpus) < intra:
+        logger.warning(
+            f"Not pinning {intra} ONNX threads, socket 0 has {len(cpus)} available cores"
+        )
+        return
+    cpus = cpus[:intra]
+    if intra < 2:
+        return  # Only the calling thread, which ORT does not pin
+    
+    # ORT takes 1-based processor IDs for the workers after the calling thread
+    options.add_session_config_entry(
+        "session.intra_op_thread_affinities",
+        ";".join(str(cpu + 1) for cpu in cpus[1:])
+    )
+    logger.debug(f"Pinned ONNX intra-op threads to CPUs {cpus}")
+
+
+def create_arena_config() -> Dict[str, int]:
+    """Create CPU memory arena configuration.
+    
+    Returns:
+        OrtArenaCfg settings sized for the model's working set
+    """
+    config = model_config.onnx_cpu
+    return {
+        "arena_extend_strategy": ARENA_EXTEND_STRATEGIES[config.arena_extend_strategy],
+        "initial_chunk_size_bytes": config.arena_initial_chunk_mb * 1024 * 1024,
+        "max_dead_bytes_per_chunk": config.arena_max_dead_mb * 1024 * 1024,
+        "initial_growth_chunk_size_bytes": config.arena_growth_chunk_mb * 1024 * 1024,
+    }
+
+
+def register_cpu_arena() -> None:
+    """Register the shared CPU arena allocator with the ONNX Runtime environment.
+    
+    Only the first call registers; sessions opt in through
+    'session.use_env_allocators'.
+    """
+    global _cpu_arena_registered
+    if _cpu_arena_registered:
+        return
+    
+    arena_config = create_arena_config()
+    onnxruntime.create_and_register_allocator(
+        OrtMemoryInfo("Cpu", OrtAllocatorType.ORT_ARENA_ALLOCATOR, 0, OrtMemType.DEFAULT),
+        OrtArenaCfg(arena_config)
+    )
+    _cpu_arena_registered = True
+    logger.info(f"Registered ONNX CPU memory arena: {arena_config}")
+
+
+def create_cpu_providers() -> Tuple[List[str], List[Dict]]:
+    """Select execution providers for CPU sessions.
+    
+    oneDNN is placed ahead of the default MLAS-based CPU provider on Intel
+    CPUs when the installed onnxruntime includes it, e.g. a build with
+    --use_dnnl. Stock wheels only ship the CPU provider.
+    
+    Returns:
+        Tuple of (provider names, provider options)
+    """
+    providers = ["CPUExecutionProvider"]
+    provider_options = [create_provider_options(is_gpu=False)]
+    if (
+        settings.onnx_use_dnnl
+        and "DnnlExecutionProvider" in onnxruntime.get_available_providers()
+        and cpu_vendor() == "GenuineIntel"
+    ):
+        providers.insert(0, "DnnlExecutionProvider")
+        provider_options.insert(0, {"use_arena": "1"})
+    return providers, provider_options
+
+
+def _save_optimized_model(
+    model_path: str,
+    opt_path: str,
+    optimization_level: str
+) -> None:
+    """Run the graph optimizer once and serialize the result in ORT format.
+    
+    Optimization always runs on the CPU provider alone, since graphs with
+    nodes compiled by other providers cannot be serialized.
+    
+    Args:
+        model_path: Path to source model file
+        opt_path: Path to write optimized model to
+        optimization_level: Optimization level name
+    """
+    options = create_cpu_session_options(model_path, optimization_level)
+    tmp_path = f"{opt_path}.{os.getpid()}.tmp"
+    options.optimized_model_filepath = tmp_path
+    options.add_session_config_entry("session.save_model_format", "ORT")
+    try:
+        InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+            provider_options=[create_provider_options(is_gpu=False)]
+        )
+        os.replace(tmp_path, opt_path)
+        logger.info(f"Saved optimized ORT model: {opt_path}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _build_cpu_session(
+    model_path: str,
+    options: SessionOptions,
+    optimization_level: str
+) -> InferenceSession:
+    """Build CPU session, reusing an offline-optimized model.
+    
+    The first load optimizes the graph and writes it next to the source
+    model; later loads read that file with optimization disabled. Call
+    before forking workers so they share the loaded weights. With oneDNN
+    the graph is optimized in memory instead, as oneDNN partitions the
+    graph at load and cannot run from a CPU-optimized ORT-format model.
+    
+    Args:
+        model_path: Path to model file
+        options: Session options
+        optimization_level: Optimization level name
+        
+    Returns:
+        ONNX inference session
+    """
+    if optimization_level != model_config.onnx_cpu.optimization_level:
+        logger.warning(
+            f"Intel CPU detected, using '{optimization_level}' ONNX optimization "
+            f"instead of '{model_config.onnx_cpu.optimization_level}'"
+        )
+    
+    providers, provider_options = create_cpu_providers()
+    if optimization_level in OPTIMIZATION_LEVELS and providers == ["CPUExecutionProvider"]:
+        opt_path = optimized_model_path(model_path, optimization_level)
+        if not os.path.exists(opt_path):
+            try:
+                _save_optimized_model(model_path, opt_path, optimization_level)
+            except Exception as e:
+                logger.warning(f"Failed to save optimized model, optimizing in memory: {e}")
+        if os.path.exists(opt_path):
+            model_path = opt_path
+            options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
+            options.add_session_config_entry("session.load_model_format", "ORT")
+    
+    logger.info(f"Creating ONNX CPU session with providers: {providers}")
+    log_cpu_features(optimization_level)
+    session = InferenceSession(
+        model_path,
+        sess_options=options,
+        providers=providers,
+        provider_options=provider_options
+    )
+    if settings.onnx_profile_kernels:
+        try:
+            profile_kernels(
+                model_path, options.graph_optimization_level, providers, provider_options
+            )
+        except Exception as e:
+            logger.warning(f"Failed to profile ONNX kernels: {e}")
+    return session
+
+
+def create_cpu_session(model_path: str) -> InferenceSession:
+    """Get CPU inference session, shared process-wide per configuration.
+    
+    Backends and pools asking for the same model, optimization level and
+    threading share one session, and with it one thread pool and arena.
+    Callers must hand the session back with release_session().
+    
+    A current shape-specialized variant is preferred when present, and is
+    produced on load with settings.onnx_shape_specialize. With
+    settings.onnx_quantize, the INT8 variant of that is used as the source.
+    
+    Args:
+        model_path: Path to model file
+        
+    Returns:
+        ONNX inference session
+    """
+    try:
+        model_path = (
+            get_shaped_model(model_path, create=settings.onnx_shape_specialize)
+            or model_path
+        )
+    except RuntimeError as e:
+        logger.warning(f"{e}, using unspecialized model")
+    
+    if settings.onnx_quantize:
+        try:
+            model_path = get_quantized_model(model_path)
+        except RuntimeError as e:
+            logger.warning(f"{e}, falling back to FP32 model")
+    
+    optimization_level = resolve_optimization_level()
+    options = create_cpu_session_options(model_path, optimization_level)
+    
+    key = (
+        model_path,
+        optimization_level,
+        options.intra_op_num_threads,
+        options.inter_op_num_threads,
+        options.execution_mode,
+        tuple(create_cpu_providers()[0]),
+    )
+    return get_or_create_session(
+        key, lambda: _build_cpu_session(model_path, options, optimization_level)
+    )
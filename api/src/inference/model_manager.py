@@ -249,7 +249,7 @@ class ModelManager:
                 raise ValueError("Text processing failed")
             
             # Run inference
-            backend.generate(tokens, voice, speed=1.0)
+            await backend.generate_async(tokens, voice, speed=1.0)
             logger.debug("Completed warmup inference")
             
         except Exception as e:
@@ -283,8 +283,8 @@ class ModelManager:
 
         try:
             # Generate audio using provided voice tensor
-            # No lock needed here since inference is thread-safe
-            return backend.generate(tokens, voice, speed)
+            # No lock needed here since backends serialize their own inference
+            return await backend.generate_async(tokens, voice, speed)
         except Exception as e:
             raise RuntimeError(f"Generation failed: {e}")
 
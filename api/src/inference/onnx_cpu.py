@@ -1,27 +1,52 @@
 """CPU-based ONNX inference backend."""
 
-from typing import Optional
+import gc
+from typing import Optional, Union
 
 import numpy as np
 import torch
 from loguru import logger
-from onnxruntime import InferenceSession
+from onnxruntime import InferenceSession, IOBinding
 
 from ..core import paths
 from ..core.model_config import model_config
 from .base import BaseModelBackend
-from .session_pool import create_session_options, create_provider_options
+from .cpu_session import create_cpu_session
+from .session_registry import release_session
+from .tokens import MAX_TOKENS, fill_tokens
+from .voice_manager import get_style
+
+# Accepted input names across model exports
+TOKEN_INPUT_NAMES = ("tokens", "input_ids")
+STYLE_INPUT_NAMES = ("style",)
+SPEED_INPUT_NAMES = ("speed",)
 
 
 class ONNXCPUBackend(BaseModelBackend):
     """ONNX-based CPU inference backend."""
 
+    _threaded_inference = True
+
     def __init__(self):
         """Initialize CPU backend."""
         super().__init__()
         self._device = "cpu"
         self._session: Optional[InferenceSession] = None
 
+        # IO binding for the current session, rebuilt when the session changes
+        self._io: Optional[IOBinding] = None
+        self._bound_session: Optional[InferenceSession] = None
+        # Session taken from the registry by load_model, as opposed to one
+        # assigned from the model manager's pool
+        self._owned_session: Optional[InferenceSession] = None
+        self._token_input_name: Optional[str] = None
+        self._style_input_name: Optional[str] = None
+        self._output_name: Optional[str] = None
+
+        # Persistent input buffers, bound to the session by pointer
+        self._tokens_buf = np.zeros((1, MAX_TOKENS + 2), dtype=np.int64)
+        self._speed_buf = np.zeros(1, dtype=np.float32)
+
     @property
     def is_loaded(self) -> bool:
         """Check if model is loaded."""
@@ -42,32 +67,60 @@ class ONNXCPUBackend(BaseModelBackend):
             
             logger.info(f"Loading ONNX model: {model_path}")
             
-            # Configure session
-            options = create_session_options(is_gpu=False)
-            provider_options = create_provider_options(is_gpu=False)
-            
-            # Create session
-            self._session = InferenceSession(
-                model_path,
-                sess_options=options,
-                providers=["CPUExecutionProvider"],
-                provider_options=[provider_options]
-            )
+            # Create session from the offline-optimized model
+            session = create_cpu_session(model_path)
+            if self._owned_session is not None:
+                release_session(self._owned_session)
+            self._session = self._owned_session = session
+            self._bind_session()
             
         except Exception as e:
             raise RuntimeError(f"Failed to load ONNX model: {e}")
 
+    def _bind_session(self) -> None:
+        """Create IO binding for the current session.
+
+        Sessions may also be assigned directly from the model manager's pool,
+        so this is re-run lazily whenever the session object changes.
+        
+        Raises:
+            RuntimeError: If the model inputs are not recognized
+        """
+        input_names = [arg.name for arg in self._session.get_inputs()]
+        
+        def resolve(candidates: tuple) -> str:
+            name = next((n for n in input_names if n in candidates), None)
+            if name is None:
+                raise RuntimeError(
+                    f"Model has none of the inputs {candidates}, got {input_names}"
+                )
+            return name
+        
+        self._token_input_name = resolve(TOKEN_INPUT_NAMES)
+        self._style_input_name = resolve(STYLE_INPUT_NAMES)
+        speed_input_name = resolve(SPEED_INPUT_NAMES)
+        
+        self._output_name = self._session.get_outputs()[0].name
+        
+        # Speed buffer stays bound for the life of the session
+        self._io = self._session.io_binding()
+        self._io.bind_input(
+            speed_input_name, "cpu", 0, np.float32, self._speed_buf.shape,
+            self._speed_buf.ctypes.data
+        )
+        self._bound_session = self._session
+
     def generate(
         self,
         tokens: list[int],
-        voice: torch.Tensor,
+        voice: Union[np.ndarray, torch.Tensor],
         speed: float = 1.0
     ) -> np.ndarray:
         """Generate audio using ONNX model.
         
         Args:
             tokens: Input token IDs
-            voice: Voice embedding tensor
+            voice: Voice embedding array or tensor
             speed: Speed multiplier
             
         Returns:
@@ -80,36 +133,46 @@ class ONNXCPUBackend(BaseModelBackend):
             raise RuntimeError("Model not loaded")
 
         try:
-            # Prepare inputs with start/end tokens
-            tokens_input = np.array([[0, *tokens, 0]], dtype=np.int64)  # Add start/end tokens
-            style_input = voice[len(tokens) + 2].numpy()  # Adjust index for start/end tokens
-            speed_input = np.full(1, speed, dtype=np.float32)
-
-            # Build base inputs
-            inputs = {
-                "style": style_input,
-                "speed": speed_input
-            }
-            
-            # Try both possible token input names #TODO: 
-            for token_name in ["tokens", "input_ids"]:
-                try:
-                    inputs[token_name] = tokens_input
-                    result = self._session.run(None, inputs)
-                    return result[0]
-                except Exception:
-                    del inputs[token_name]
-                    continue
-                    
-            raise RuntimeError("Model does not accept either 'tokens' or 'input_ids' as input name")
+            if self._bound_session is not self._session:
+                self._bind_session()
+
+            # Fill persistent buffers in place, adding start/end tokens
+            toks = np.asarray(tokens, dtype=np.int64)
+            n = toks.size + 2
+            if n > self._tokens_buf.shape[1]:
+                raise ValueError(f"Too many tokens: {toks.size} > {MAX_TOKENS}")
+            fill_tokens(self._tokens_buf, toks, toks.size)
+            style_input = get_style(voice, n)  # Adjust index for start/end tokens
+            self._speed_buf[0] = speed
+
+            # Rebind inputs whose shape or address changes per call
+            io = self._io
+            io.bind_input(
+                self._token_input_name, "cpu", 0, np.int64, (1, n),
+                self._tokens_buf.ctypes.data
+            )
+            io.bind_input(
+                self._style_input_name, "cpu", 0, np.float32, style_input.shape,
+                style_input.ctypes.data
+            )
+            # Output length varies with input, so let ORT allocate it each run
+            io.bind_output(self._output_name, "cpu")
+            self._session.run_with_iobinding(io)
+            return io.copy_outputs_to_cpu()[0]
             
         except Exception as e:
             raise RuntimeError(f"Generation failed: {e}")
 
     def unload(self) -> None:
         """Unload model and free resources."""
+        self._shutdown_infer_pool()
+        if self._owned_session is not None:
+            release_session(self._owned_session)
+            self._owned_session = None
         if self._session is not None:
             del self._session
             self._session = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
\ No newline at end of file
+            self._io = None
+            self._bound_session = None
+            # No torch.cuda here: probing it initializes the CUDA driver
+            gc.collect()
\ No newline at end of file
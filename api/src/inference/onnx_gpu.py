@@ -10,12 +10,16 @@ from onnxruntime import InferenceSession
 from ..core import paths
 from ..core.model_config import model_config
 from .base import BaseModelBackend
-from .session_pool import create_session_options, create_provider_options
+from .session_options import create_provider_options, create_session_options
+from .tokens import MAX_TOKENS, fill_tokens
+from .voice_manager import get_style
 
 
 class ONNXGPUBackend(BaseModelBackend):
     """ONNX-based GPU inference backend."""
 
+    _threaded_inference = True
+
     def __init__(self):
         """Initialize GPU backend."""
         super().__init__()
@@ -24,6 +28,10 @@ class ONNXGPUBackend(BaseModelBackend):
         self._device = "cuda"
         self._session: Optional[InferenceSession] = None
         
+        # Persistent host-side input buffers
+        self._tokens_buf = np.zeros((1, MAX_TOKENS + 2), dtype=np.int64)
+        self._speed_buf = np.zeros(1, dtype=np.float32)
+        
         # Configure GPU
         torch.cuda.set_device(model_config.onnx_gpu.device_id)
 
@@ -85,12 +93,18 @@ class ONNXGPUBackend(BaseModelBackend):
             raise RuntimeError("Model not loaded")
 
         try:
-            # Prepare inputs
-            tokens_input = np.array([[0, *tokens, 0]], dtype=np.int64)  # Add start/end tokens
+            # Fill persistent buffers in place, adding start/end tokens
+            toks = np.asarray(tokens, dtype=np.int64)
+            n = toks.size + 2
+            if n > self._tokens_buf.shape[1]:
+                raise ValueError(f"Too many tokens: {toks.size} > {MAX_TOKENS}")
+            fill_tokens(self._tokens_buf, toks, toks.size)
+            tokens_input = self._tokens_buf[:, :n]
             # Use modulo to ensure index stays within voice tensor bounds
-            style_idx = (len(tokens) + 2) % voice.size(0)  # Add 2 for start/end tokens
-            style_input = voice[style_idx].cpu().numpy()  # Move to CPU for ONNX
-            speed_input = np.full(1, speed, dtype=np.float32)
+            style_idx = n % voice.size(0)
+            style_input = get_style(voice, style_idx)  # Cached on CPU for ONNX
+            self._speed_buf[0] = speed
+            speed_input = self._speed_buf
 
             # Run inference
             result = self._session.run(
@@ -113,6 +127,7 @@ class ONNXGPUBackend(BaseModelBackend):
 
     def unload(self) -> None:
         """Unload model and free resources."""
+        self._shutdown_infer_pool()
         if self._session is not None:
             del self._session
             self._session = None
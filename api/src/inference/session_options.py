@@ -0,0 +1,76 @@
+"""ONNX Runtime session and provider options."""
+
+from typing import Dict, Optional
+
+import torch
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, SessionOptions
+
+from ..core.model_config import model_config
+
+OPTIMIZATION_LEVELS = {
+    "all": GraphOptimizationLevel.ORT_ENABLE_ALL,
+    "extended": GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "basic": GraphOptimizationLevel.ORT_ENABLE_BASIC,
+}
+
+
+def create_session_options(
+    is_gpu: bool = False,
+    optimization_level: Optional[str] = None
+) -> SessionOptions:
+    """Create ONNX session options.
+    
+    Args:
+        is_gpu: Whether to use GPU configuration
+        optimization_level: Optimization level name, taken from config if None
+        
+    Returns:
+        Configured session options
+    """
+    options = SessionOptions()
+    config = model_config.onnx_gpu if is_gpu else model_config.onnx_cpu
+    
+    # Set optimization level
+    options.graph_optimization_level = OPTIMIZATION_LEVELS.get(
+        optimization_level or config.optimization_level,
+        GraphOptimizationLevel.ORT_DISABLE_ALL
+    )
+    
+    # Configure threading
+    options.intra_op_num_threads = config.num_threads
+    options.inter_op_num_threads = config.inter_op_threads
+    
+    # Set execution mode
+    options.execution_mode = (
+        ExecutionMode.ORT_PARALLEL
+        if config.execution_mode == "parallel"
+        else ExecutionMode.ORT_SEQUENTIAL
+    )
+    
+    # Configure memory optimization
+    options.enable_mem_pattern = config.memory_pattern
+    
+    return options
+
+
+def create_provider_options(is_gpu: bool = False) -> Dict:
+    """Create provider options.
+    
+    Args:
+        is_gpu: Whether to use GPU configuration
+        
+    Returns:
+        Provider configuration
+    """
+    if is_gpu:
+        config = model_config.onnx_gpu
+        return {
+            "device_id": config.device_id,
+            "arena_extend_strategy": config.arena_extend_strategy,
+            "gpu_mem_limit": int(config.gpu_mem_limit * torch.cuda.get_device_properties(0).total_memory),
+            "cudnn_conv_algo_search": config.cudnn_conv_algo_search,
+            "do_copy_in_default_stream": config.do_copy_in_default_stream
+        }
+    else:
+        # The CPU arena is configured on the shared environment allocator
+        return {}
@@ -5,17 +5,14 @@ import time
 from dataclasses import dataclass
 from typing import Dict, Optional, Set
 
-import torch
 from loguru import logger
-from onnxruntime import (
-    ExecutionMode,
-    GraphOptimizationLevel,
-    InferenceSession,
-    SessionOptions
-)
+from onnxruntime import InferenceSession
 
 from ..core import paths
 from ..core.model_config import model_config
+from .cpu_session import create_cpu_session
+from .session_options import create_provider_options, create_session_options
+from .session_registry import release_session
 
 
 @dataclass
@@ -26,68 +23,6 @@ class SessionInfo:
     stream_id: Optional[int] = None
 
 
-def create_session_options(is_gpu: bool = False) -> SessionOptions:
-    """Create ONNX session options.
-    
-    Args:
-        is_gpu: Whether to use GPU configuration
-        
-    Returns:
-        Configured session options
-    """
-    options = SessionOptions()
-    config = model_config.onnx_gpu if is_gpu else model_config.onnx_cpu
-    
-    # Set optimization level
-    if config.optimization_level == "all":
-        options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_ALL
-    elif config.optimization_level == "basic":
-        options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_BASIC
-    else:
-        options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
-    
-    # Configure threading
-    options.intra_op_num_threads = config.num_threads
-    options.inter_op_num_threads = config.inter_op_threads
-    
-    # Set execution mode
-    options.execution_mode = (
-        ExecutionMode.ORT_PARALLEL
-        if config.execution_mode == "parallel"
-        else ExecutionMode.ORT_SEQUENTIAL
-    )
-    
-    # Configure memory optimization
-    options.enable_mem_pattern = config.memory_pattern
-    
-    return options
-
-
-def create_provider_options(is_gpu: bool = False) -> Dict:
-    """Create provider options.
-    
-    Args:
-        is_gpu: Whether to use GPU configuration
-        
-    Returns:
-        Provider configuration
-    """
-    if is_gpu:
-        config = model_config.onnx_gpu
-        return {
-            "device_id": config.device_id,
-            "arena_extend_strategy": config.arena_extend_strategy,
-            "gpu_mem_limit": int(config.gpu_mem_limit * torch.cuda.get_device_properties(0).total_memory),
-            "cudnn_conv_algo_search": config.cudnn_conv_algo_search,
-            "do_copy_in_default_stream": config.do_copy_in_default_stream
-        }
-    else:
-        return {
-            "arena_extend_strategy": model_config.onnx_cpu.arena_extend_strategy,
-            "cpu_memory_arena_cfg": "cpu:0"
-        }
-
-
 class BaseSessionPool:
     """Base session pool implementation."""
     
@@ -153,7 +88,7 @@ class BaseSessionPool:
         ]
         for path in expired:
             logger.info(f"Removing expired session: {path}")
-            del self._sessions[path]
+            self._release_session(self._sessions.pop(path).session)
             
     async def _create_session(self, model_path: str) -> InferenceSession:
         """Create new session.
@@ -166,8 +101,18 @@ class BaseSessionPool:
         """
         raise NotImplementedError
         
+    def _release_session(self, session: InferenceSession) -> None:
+        """Release a session removed from the pool.
+        
+        Args:
+            session: Session being removed
+        """
+        pass
+        
     def cleanup(self) -> None:
         """Clean up all sessions."""
+        for info in self._sessions.values():
+            self._release_session(info.session)
         self._sessions.clear()
 
 
@@ -261,12 +206,8 @@ class CPUSessionPool(BaseSessionPool):
     async def _create_session(self, model_path: str) -> InferenceSession:
         """Create new session with CPU provider."""
         abs_path = await paths.get_model_path(model_path)
-        options = create_session_options(is_gpu=False)
-        provider_options = create_provider_options(is_gpu=False)
+        return create_cpu_session(abs_path)
         
-        return InferenceSession(
-            abs_path,
-            sess_options=options,
-            providers=["CPUExecutionProvider"],
-            provider_options=[provider_options]
-        )
\ No newline at end of file
+    def _release_session(self, session: InferenceSession) -> None:
+        """Return session to the process-wide registry."""
+        release_session(session)
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Process-wide registry of shared ONNX inference sessions."""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable
+
+from loguru import logger
+from onnxruntime import InferenceSession
+
+
+@dataclass
+class SharedSession:
+    """Registered session and its reference count."""
+    session: InferenceSession
+    refs: int = 0
+
+
+# Sessions keyed by model path and the options that shape them
+_SESSION_CACHE: Dict[Hashable, SharedSession] = {}
+_lock = threading.Lock()
+
+
+def get_or_create_session(
+    key: Hashable,
+    factory: Callable[[], InferenceSession]
+) -> InferenceSession:
+    """Get shared session for a key, creating it if needed.
+
+    Every call takes a reference that must be returned with release_session().
+
+    Args:
+        key: Session identity, e.g. (model path, optimization level, threads)
+        factory: Creates the session when none is registered
+
+    Returns:
+        Shared ONNX inference session
+    """
+    with _lock:
+        shared = _SESSION_CACHE.get(key)
+        if shared is None:
+            shared = SharedSession(factory())
+            _SESSION_CACHE[key] = shared
+            logger.debug(f"Registered shared ONNX session: {key}")
+        shared.refs += 1
+        return shared.session
+
+
+def release_session(session: InferenceSession) -> None:
+    """Return a reference to a shared session, dropping it when unused.
+
+    Args:
+        session: Session obtained from get_or_create_session()
+    """
+    with _lock:
+        for key, shared in _SESSION_CACHE.items():
+            if shared.session is session:
+                shared.refs -= 1
+                if shared.refs <= 0:
+                    del _SESSION_CACHE[key]
+                    logger.debug(f"Released shared ONNX session: {key}")
+                return
@@ -0,0 +1,118 @@
+"""Shape specialization of ONNX models for CPU inference.
+
+Run directly to specialize a model ahead of time:
+
+    python -m api.src.inference.shape_specialize path/to/model.onnx
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+from loguru import logger
+
+# Batch size the backends always run with
+BATCH_SIZE = 1
+
+
+def shaped_model_path(model_path: str) -> str:
+    """Get path of the shape-specialized variant of a model.
+
+    Args:
+        model_path: Path to source model file
+
+    Returns:
+        Path to shaped model file
+    """
+    stem, ext = os.path.splitext(model_path)
+    return f"{stem}.shaped{ext}"
+
+
+def specialize_model(model_path: str, out_path: str) -> None:
+    """Fix the batch dimension and annotate inferred shapes.
+
+    Symbolic shape inference records intermediate shapes in the graph, and
+    fixing the batch dimension lets the optimizer constant-fold shape
+    arithmetic. The token dimension stays dynamic, since inputs vary in
+    length and padding would change the audio.
+
+    Args:
+        model_path: Path to source model file
+        out_path: Path to write shaped model to
+
+    Raises:
+        RuntimeError: If specialization fails
+    """
+    try:
+        import onnx
+        from onnxruntime.tools.onnx_model_utils import make_dim_param_fixed
+        from onnxruntime.tools.symbolic_shape_infer import SymbolicShapeInference
+    except ImportError as e:
+        raise RuntimeError(f"Shape specialization requires the 'onnx' package: {e}")
+    except Exception as e:
+        raise RuntimeError(f"Failed to import ONNX Runtime model tools: {e}")
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        model = onnx.load(model_path)
+
+        # Fix symbolic batch dims on inputs with a leading batch axis
+        for graph_input in model.graph.input:
+            dims = graph_input.type.tensor_type.shape.dim
+            if len(dims) > 1 and dims[0].dim_param:
+                make_dim_param_fixed(model.graph, dims[0].dim_param, BATCH_SIZE)
+
+        model = SymbolicShapeInference.infer_shapes(model, auto_merge=True)
+        onnx.save(model, tmp_path)
+        os.replace(tmp_path, out_path)
+        logger.info(f"Saved shape-specialized model: {out_path}")
+    except Exception as e:
+        raise RuntimeError(f"Failed to specialize {model_path}: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_shaped_model(model_path: str, create: bool = False) -> Optional[str]:
+    """Get shape-specialized variant of a model if available.
+
+    Args:
+        model_path: Path to source model file
+        create: Whether to produce the variant when missing or stale
+
+    Returns:
+        Path to shaped model file, or None if there is no current variant
+
+    Raises:
+        RuntimeError: If specialization fails
+    """
+    out_path = shaped_model_path(model_path)
+    stale = (
+        not os.path.exists(out_path)
+        or os.path.getmtime(out_path) < os.path.getmtime(model_path)
+    )
+    if stale:
+        if not create:
+            return None
+        logger.info(f"Specializing ONNX model shapes: {model_path}")
+        specialize_model(model_path, out_path)
+    return out_path
+
+
+def main() -> int:
+    """Specialize a model file from the command line."""
+    parser = argparse.ArgumentParser(description="Shape-specialize an ONNX model")
+    parser.add_argument("model", help="Path to ONNX model")
+    parser.add_argument("--quantize", action="store_true", help="Also write an INT8 variant")
+    args = parser.parse_args()
+
+    out_path = get_shaped_model(args.model, create=True)
+    if args.quantize:
+        from .quantize import get_quantized_model
+        get_quantized_model(out_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Token input buffers shared by the ONNX backends."""
+
+import numpy as np
+from loguru import logger
+
+try:
+    from numba import njit
+except ImportError:  # Optional, token fill falls back to NumPy slicing
+    njit = None
+
+
+# Voice packs hold one style vector per sequence length
+MAX_TOKENS = 510
+
+
+def _fill_tokens_numpy(buf: np.ndarray, toks: np.ndarray, n: int) -> None:
+    """Write tokens into a (1, MAX_TOKENS + 2) buffer between start/end pads."""
+    buf[0, 0] = 0
+    buf[0, 1:n + 1] = toks
+    buf[0, n + 1] = 0
+
+
+fill_tokens = _fill_tokens_numpy
+if njit is not None:
+    try:
+        fill_tokens = njit(cache=True)(_fill_tokens_numpy)
+    except Exception as e:  # e.g. no writable cache directory
+        logger.warning(f"Numba token fill unavailable, using NumPy: {e}")
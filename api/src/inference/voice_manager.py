@@ -1,8 +1,12 @@
 """Voice pack management and caching."""
 
+import hashlib
 import os
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import torch
 from loguru import logger
 
@@ -10,6 +14,83 @@ from ..core import paths
 from ..core.config import settings
 from ..structures.model_schemas import VoiceConfig
 
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # Optional, hashlib's BLAKE2 is fast enough for voice packs
+    _hasher = hashlib.blake2b
+
+
+def _content_hash(data: bytes) -> str:
+    """Hash bytes to a short hex key."""
+    return _hasher(data).hexdigest()[:16]
+
+
+# Style vectors keyed by (voice content hash, index), least recently used first
+STYLE_CACHE_SIZE = 4096
+_style_cache: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+_style_lock = threading.Lock()
+
+
+def _voice_key(voice: torch.Tensor) -> str:
+    """Get content hash of a voice tensor.
+    
+    The hash is computed once per tensor object and stored on it.
+    """
+    voice_key = getattr(voice, "_style_cache_key", None)
+    if voice_key is None:
+        data = np.ascontiguousarray(voice.detach().cpu().numpy()).tobytes()
+        voice_key = _content_hash(data)
+        voice._style_cache_key = voice_key
+    return voice_key
+
+
+def get_style(voice: Union[np.ndarray, torch.Tensor], index: int) -> np.ndarray:
+    """Get style vector for a sequence length from a voice.
+    
+    NumPy voices are sliced directly. Tensor results are cached by voice
+    content and index, so repeated lengths skip the tensor indexing and NumPy
+    conversion, including for reloaded or identically combined voices.
+    Cached arrays are shared, so they are returned read-only.
+    
+    Args:
+        voice: Voice embedding array or tensor
+        index: Style index, usually the token count including start/end tokens
+        
+    Returns:
+        Contiguous float32 style array
+    """
+    if isinstance(voice, np.ndarray):
+        return np.ascontiguousarray(voice[index], dtype=np.float32)
+    
+    key = (_voice_key(voice), index)
+    with _style_lock:
+        style = _style_cache.get(key)
+        if style is not None:
+            _style_cache.move_to_end(key)
+            return style
+    
+    style = np.array(voice[index].cpu().numpy(), dtype=np.float32)
+    style.flags.writeable = False
+    with _style_lock:
+        style = _style_cache.setdefault(key, style)
+        if len(_style_cache) > STYLE_CACHE_SIZE:
+            _style_cache.popitem(last=False)
+    return style
+
+
+def invalidate_voice_cache(voice: torch.Tensor) -> None:
+    """Drop cached style vectors for a voice.
+    
+    Args:
+        voice: Voice embedding tensor being unloaded
+    """
+    voice_key = getattr(voice, "_style_cache_key", None)
+    if voice_key is None:
+        return
+    with _style_lock:
+        for key in [key for key in _style_cache if key[0] == voice_key]:
+            del _style_cache[key]
+
 
 class VoiceManager:
     """Manages voice loading and operations."""
@@ -64,7 +145,12 @@ class VoiceManager:
                 except Exception as e:
                     raise RuntimeError(f"Failed to load base voice {voice}: {e}")
                     
-            return torch.mean(torch.stack(voice_tensors), dim=0)
+            combined = torch.mean(torch.stack(voice_tensors), dim=0)
+            # Key by components, so per-request combinations are never hashed
+            combined._style_cache_key = _content_hash(
+                "+".join(_voice_key(v) for v in voice_tensors).encode()
+            )
+            return combined
 
         # Handle single voice
         voice_path = self.get_voice_path(voice_name)
@@ -95,7 +181,7 @@ class VoiceManager:
         if len(self._voice_cache) >= self._config.cache_size:
             # Remove least recently used voice
             oldest = next(iter(self._voice_cache))
-            del self._voice_cache[oldest]
+            invalidate_voice_cache(self._voice_cache.pop(oldest))
             torch.cuda.empty_cache()  # Clean up GPU memory if needed
             logger.debug(f"Removed LRU voice from cache: {oldest}")
 
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from onnxruntime import InferenceSession
+
+from ..src.inference.onnx_cpu import ONNXCPUBackend
+
+onnx = pytest.importorskip("onnx")
+from onnx import TensorProto, helper
+
+
+@pytest.fixture
+def tiny_session():
+    """Session whose audio length follows the token count"""
+    nodes = [
+        helper.make_node("Cast", ["tokens"], ["tokens_f"], to=TensorProto.FLOAT),
+        helper.make_node("ReduceSum", ["style"], ["style_sum"], keepdims=0),
+        helper.make_node("Mul", ["tokens_f", "speed"], ["scaled"]),
+        helper.make_node("Add", ["scaled", "style_sum"], ["audio"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "tiny",
+        [
+            helper.make_tensor_value_info("tokens", TensorProto.INT64, [1, "T"]),
+            helper.make_tensor_value_info("style", TensorProto.FLOAT, [1, 256]),
+            helper.make_tensor_value_info("speed", TensorProto.FLOAT, [1]),
+        ],
+        [helper.make_tensor_value_info("audio", TensorProto.FLOAT, [1, "T"])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    return InferenceSession(
+        model.SerializeToString(), providers=["CPUExecutionProvider"]
+    )
+
+
+def test_generate_varying_lengths(tiny_session):
+    """Test consecutive calls with different token counts"""
+    backend = ONNXCPUBackend()
+    backend._session = tiny_session
+    voice = np.zeros((512, 1, 256), dtype=np.float32)
+
+    for length in (3, 20, 7):
+        audio = backend.generate(list(range(1, length + 1)), voice, speed=2.0)
+        assert audio.shape == (1, length + 2)
+        assert audio[0, 0] == 0 and audio[0, 1] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_unload_stops_infer_thread(tiny_session):
+    """Test the inference thread stops on unload and restarts on reuse"""
+    backend = ONNXCPUBackend()
+    backend._session = tiny_session
+    voice = np.zeros((512, 1, 256), dtype=np.float32)
+
+    audio = await backend.generate_async([1, 2], voice, speed=1.0)
+    assert audio.shape == (1, 4)
+
+    pool = backend._infer_pool
+    backend.unload()
+    assert backend._infer_pool is None
+    assert pool._shutdown
+
+    # Sessions assigned directly, as from the model manager's pool, restart it
+    backend._session = tiny_session
+    await backend.generate_async([1], voice, speed=1.0)
+    assert backend._infer_pool is not None
+    backend.unload()
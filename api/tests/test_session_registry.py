@@ -0,0 +1,58 @@
+import pytest
+
+from ..src.core.config import settings
+from ..src.inference import session_pool
+from ..src.inference.cpu_session import create_cpu_session
+from ..src.inference.session_registry import _SESSION_CACHE, release_session
+
+onnx = pytest.importorskip("onnx")
+from onnx import TensorProto, helper
+
+
+def _registered(session):
+    return any(shared.session is session for shared in _SESSION_CACHE.values())
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch):
+    """Tiny model file, with thread tuning cached next to it"""
+    graph = helper.make_graph(
+        [helper.make_node("Cast", ["tokens"], ["audio"], to=TensorProto.FLOAT)],
+        "tiny",
+        [helper.make_tensor_value_info("tokens", TensorProto.INT64, [1, "T"])],
+        [helper.make_tensor_value_info("audio", TensorProto.FLOAT, [1, "T"])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    path = tmp_path / "tiny.onnx"
+    onnx.save(model, str(path))
+    monkeypatch.setattr(settings, "onnx_tune_cache_dir", str(tmp_path))
+    return str(path)
+
+
+def test_create_cpu_session_shared(model_path):
+    """Test same-config sessions are shared until every reference is released"""
+    first = create_cpu_session(model_path)
+    second = create_cpu_session(model_path)
+    assert first is second
+
+    release_session(first)
+    assert _registered(first)
+
+    release_session(second)
+    assert not _registered(first)
+
+
+@pytest.mark.asyncio
+async def test_cpu_pool_cleanup_releases(model_path, monkeypatch):
+    """Test pool cleanup hands its sessions back to the registry"""
+    async def get_model_path(path):
+        return path
+
+    monkeypatch.setattr(session_pool.paths, "get_model_path", get_model_path)
+    pool = session_pool.CPUSessionPool()
+    session = await pool.get_session(model_path)
+    assert _registered(session)
+
+    pool.cleanup()
+    assert not _registered(session)
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from ..src.inference.tokens import MAX_TOKENS, _fill_tokens_numpy, fill_tokens
+
+
+@pytest.mark.parametrize("fill", [fill_tokens, _fill_tokens_numpy])
+@pytest.mark.parametrize("n", [0, 3, MAX_TOKENS])
+def test_fill_tokens(fill, n):
+    """Test tokens are written between start/end pads, numba-compiled if available"""
+    buf = np.full((1, MAX_TOKENS + 2), -1, dtype=np.int64)
+    toks = np.arange(1, n + 1, dtype=np.int64)
+
+    fill(buf, toks, n)
+
+    assert buf[0, 0] == 0
+    assert np.array_equal(buf[0, 1:n + 1], toks)
+    assert buf[0, n + 1] == 0
+    assert np.all(buf[0, n + 2:] == -1)
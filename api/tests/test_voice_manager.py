@@ -1,9 +1,14 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+import numpy as np
 import torch
 from pathlib import Path
 
-from ..src.inference.voice_manager import VoiceManager
+from ..src.inference.voice_manager import (
+    VoiceManager,
+    get_style,
+    invalidate_voice_cache,
+)
 from ..src.structures.model_schemas import VoiceConfig
 
 
@@ -115,6 +120,42 @@ def test_cache_management(mock_voice_tensor):
     assert len(voice_manager._voice_cache) <= 2
 
 
+def test_get_style_cached():
+    """Test style vectors are cached per voice and index"""
+    voice = torch.randn(10, 1, 256)
+    
+    style = get_style(voice, 3)
+    assert style.dtype == np.float32
+    assert not style.flags.writeable
+    assert np.array_equal(style, voice[3].numpy())
+    assert get_style(voice, 3) is style
+    
+    # Invalidation drops only this voice's cached copies
+    other = torch.randn(10, 1, 256)
+    other_style = get_style(other, 3)
+    invalidate_voice_cache(voice)
+    assert get_style(voice, 3) is not style
+    assert get_style(other, 3) is other_style
+
+
+def test_get_style_shared_by_content():
+    """Test equal voices share cached style vectors"""
+    voice = torch.randn(10, 1, 256)
+    
+    style = get_style(voice, 4)
+    assert get_style(voice.clone(), 4) is style
+    assert get_style(voice + 1, 4) is not style
+
+
+def test_get_style_numpy():
+    """Test NumPy voices are sliced without conversion"""
+    voice = np.random.rand(10, 1, 256).astype(np.float32)
+    
+    style = get_style(voice, 3)
+    assert style.shape == (1, 256)
+    assert np.shares_memory(style, voice)
+
+
 @pytest.mark.asyncio
 async def test_voice_loading_with_cache(voice_manager, mock_voice_tensor):
     """Test voice loading with cache enabled"""